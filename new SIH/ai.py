@@ -7,9 +7,9 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.preprocessing import OrdinalEncoder
 from sklearn.impute import SimpleImputer
-import matplotlib.pyplot as plt
 import warnings
 from twilio.rest import Client
+from chart_service import RISK_LABELS, render_risk_distribution
 import sys # <-- This line allows the script to read command-line arguments
 
 # Suppress warnings for cleaner output
@@ -143,9 +143,9 @@ def generate_reports(df, mentors, allocation_map):
 
 def visualize_results(df):
     risk_counts = df['risk_category'].value_counts()
-    plt.figure(figsize=(8, 8)); plt.pie(risk_counts, labels=risk_counts.index, autopct='%1.1f%%', startangle=140)
-    plt.title('Student Risk Category Distribution', fontsize=16); plt.ylabel('')
-    plt.savefig('risk_distribution.png')
+    counts = {label: int(risk_counts.get(label, 0)) for label in RISK_LABELS}
+    with open('risk_distribution.png', 'wb') as f:
+        f.write(render_risk_distribution(counts, fmt='png'))
     print("📊 Risk distribution chart saved as 'risk_distribution.png'")
 
 # --- Main Execution ---
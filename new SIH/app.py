@@ -1,10 +1,13 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for, session
+from flask import Flask, render_template, jsonify, request, redirect, url_for, session, make_response
 import pandas as pd
 import sys
 import numpy as np
 import os
-import matplotlib.pyplot as plt
 import warnings
+from chart_service import (
+    CHART_DPIS, CHART_FORMATS, CHART_RENDERERS, DEFAULT_DPI,
+    ChartCache, chart_etag, dataset_version
+)
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
@@ -18,6 +21,12 @@ ADMIN_CREDENTIALS = {"username": "admin", "password": "password123"}
 # Mentor credentials will be generated dynamically
 MENTOR_CREDENTIALS = {}
 
+# --- Chart Cache ---
+# Rendered charts are keyed by dataset version, so they are only redrawn when the report changes
+chart_cache = ChartCache(max_entries=32)
+CHART_MAX_AGE = 3600
+DATASET_VERSION = None
+
 # --- AI Script Functions (Integrated from ai.py) ---
 def load_student_data(filepath):
     """Loads student data and maps columns to a standard format."""
@@ -139,6 +148,9 @@ def generate_student_data():
         print(f"❌ Error: The file at {student_report_filepath} was not found.")
         return None
 
+    global DATASET_VERSION
+    DATASET_VERSION = dataset_version(student_report_filepath)
+
     mentors = load_mentor_data(mentor_filepath)
     if mentors is not None:
         global MENTOR_CREDENTIALS
@@ -171,6 +183,25 @@ else:
     students_data = []
     print("\n❌ FATAL ERROR: Data generation failed. Check CSV files.")
 
+def count_risk_categories():
+    """Counts students in each risk category."""
+    risk_counts = pd.DataFrame(students_data)['risk_category'].value_counts()
+    return {label: int(risk_counts.get(label, 0)) for label in ['High Risk', 'Medium Risk', 'Low Risk']}
+
+def count_mentor_workload():
+    """Counts each mentor's students per risk category."""
+    df = pd.DataFrame(students_data)
+
+    # Group by mentor and count students in each risk category
+    mentor_risk_counts = df.groupby('mentor_name')['risk_category'].value_counts().unstack(fill_value=0)
+
+    # Re-order columns for consistent display
+    mentor_risk_counts = mentor_risk_counts.reindex(columns=['High Risk', 'Medium Risk', 'Low Risk'], fill_value=0)
+
+    mentor_risk_counts['Total Students'] = mentor_risk_counts.sum(axis=1)
+
+    return mentor_risk_counts.reset_index().to_dict(orient='records')
+
 # --- Page Routes ---
 @app.route('/')
 def login_page():
@@ -181,7 +212,7 @@ def login_page():
 def dashboard():
     """Renders the admin dashboard page."""
     if session.get('user_type') == 'admin':
-        return render_template('dashboard.html')
+        return render_template('dashboard.html', dataset_version=DATASET_VERSION)
     else:
         return redirect(url_for('login_page'))
 
@@ -246,14 +277,12 @@ def get_statistics():
         return jsonify({"error": "Unauthorized access"}), 403
     if not students_data:
         return jsonify({"total": 0, "high_risk": 0, "medium_risk": 0, "low_risk": 0})
-    df_stats = pd.DataFrame(students_data)
-    total_students = len(df_stats)
-    risk_counts = df_stats['risk_category'].value_counts()
+    risk_counts = count_risk_categories()
     stats = {
-        "total": total_students,
-        "high_risk": int(risk_counts.get('High Risk', 0)),
-        "medium_risk": int(risk_counts.get('Medium Risk', 0)),
-        "low_risk": int(risk_counts.get('Low Risk', 0))
+        "total": len(students_data),
+        "high_risk": risk_counts['High Risk'],
+        "medium_risk": risk_counts['Medium Risk'],
+        "low_risk": risk_counts['Low Risk']
     }
     return jsonify(stats)
 
@@ -266,17 +295,35 @@ def get_mentor_stats():
     if not students_data:
         return jsonify([])
 
-    df = pd.DataFrame(students_data)
-    
-    # Group by mentor and count students in each risk category
-    mentor_risk_counts = df.groupby('mentor_name')['risk_category'].value_counts().unstack(fill_value=0)
-    
-    # Re-order columns for consistent display
-    mentor_risk_counts = mentor_risk_counts.reindex(columns=['High Risk', 'Medium Risk', 'Low Risk'], fill_value=0)
-    
-    mentor_risk_counts['Total Students'] = mentor_risk_counts.sum(axis=1)
-    
-    return jsonify(mentor_risk_counts.reset_index().to_dict(orient='records'))
+    return jsonify(count_mentor_workload())
+
+@app.route('/api/charts/<name>')
+def get_chart(name):
+    """API endpoint serving server-rendered dashboard charts (for admin)."""
+    if session.get('user_type') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+    if name not in CHART_RENDERERS:
+        return jsonify({"error": f"Unknown chart '{name}'"}), 404
+
+    fmt = request.args.get('format', 'png').lower()
+    dpi = request.args.get('dpi', DEFAULT_DPI, type=int)
+    if fmt not in CHART_FORMATS or dpi not in CHART_DPIS:
+        return jsonify({"error": "Unsupported chart format or dpi"}), 400
+
+    def render():
+        if name == 'risk_distribution':
+            counts = count_risk_categories() if students_data else {}
+        else:
+            counts = count_mentor_workload() if students_data else []
+        return CHART_RENDERERS[name](counts, fmt=fmt, dpi=dpi)
+
+    cache_key = (name, DATASET_VERSION, fmt, dpi)
+    response = make_response(chart_cache.get_or_render(cache_key, render))
+    response.mimetype = CHART_FORMATS[fmt]
+    response.set_etag(chart_etag(cache_key))
+    response.cache_control.private = True
+    response.cache_control.max_age = CHART_MAX_AGE
+    return response.make_conditional(request)
 
 @app.route('/logout')
 def logout():
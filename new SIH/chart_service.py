@@ -0,0 +1,100 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# --- Chart Configuration ---
+RISK_LABELS = ['High Risk', 'Medium Risk', 'Low Risk']
+# Same colours as the stat cards in static/css/style.css
+RISK_COLORS = {'High Risk': '#dc3545', 'Medium Risk': '#ffc107', 'Low Risk': '#198754'}
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+# Only a few resolutions are accepted so the cache cannot be flooded with variants
+CHART_DPIS = (72, 100, 150)
+DEFAULT_DPI = 100
+
+def dataset_version(filepath):
+    """Returns a short content hash of a dataset file, used to key cached charts."""
+    try:
+        with open(filepath, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()[:12]
+    except FileNotFoundError:
+        return 'missing'
+
+def _figure_bytes(fig, fmt, dpi):
+    """Renders a figure with the Agg canvas (no pyplot state) and returns the encoded bytes."""
+    FigureCanvasAgg(fig)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+def render_risk_distribution(risk_counts, fmt='png', dpi=DEFAULT_DPI):
+    """Draws the risk category pie chart from a {category: count} mapping."""
+    labels = [label for label in RISK_LABELS if risk_counts.get(label, 0) > 0]
+    fig = Figure(figsize=(8, 8))
+    ax = fig.add_subplot()
+    if labels:
+        ax.pie([risk_counts[label] for label in labels], labels=labels,
+               colors=[RISK_COLORS[label] for label in labels],
+               autopct='%1.1f%%', startangle=140)
+    else:
+        ax.text(0.5, 0.5, 'No student data', ha='center', va='center', fontsize=14)
+        ax.axis('off')
+    ax.set_title('Student Risk Category Distribution', fontsize=16)
+    return _figure_bytes(fig, fmt, dpi)
+
+def render_mentor_workload(mentor_counts, fmt='png', dpi=DEFAULT_DPI):
+    """Draws a stacked bar chart of students per mentor, split by risk category."""
+    mentor_names = [row['mentor_name'] for row in mentor_counts]
+    fig = Figure(figsize=(10, max(4, 0.4 * len(mentor_names) + 1.5)))
+    ax = fig.add_subplot()
+    if mentor_names:
+        left = [0] * len(mentor_names)
+        for label in RISK_LABELS:
+            values = [int(row.get(label, 0)) for row in mentor_counts]
+            ax.barh(mentor_names, values, left=left, color=RISK_COLORS[label], label=label)
+            left = [l + v for l, v in zip(left, values)]
+        ax.invert_yaxis()
+        ax.set_xlabel('Number of Students')
+        ax.legend(loc='lower right')
+    else:
+        ax.text(0.5, 0.5, 'No mentor data', ha='center', va='center', fontsize=14)
+        ax.axis('off')
+    ax.set_title('Mentor Workload by Risk Category', fontsize=16)
+    return _figure_bytes(fig, fmt, dpi)
+
+CHART_RENDERERS = {
+    'risk_distribution': render_risk_distribution,
+    'mentor_workload': render_mentor_workload,
+}
+
+class ChartCache:
+    """Thread-safe LRU cache of rendered chart bytes."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        """Returns the cached bytes for key, calling render() only on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            # Render under the lock so concurrent misses don't draw the same chart twice
+            data = render()
+            self._entries[key] = data
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def chart_etag(key):
+    """Builds a stable ETag from a cache key (name, dataset version, format, dpi)."""
+    return hashlib.sha1('|'.join(str(part) for part in key).encode()).hexdigest()[:16]